@@ -8,7 +8,9 @@ setup(
         "fastapi>=0.104.0",
         "uvicorn>=0.24.0",
         "python-multipart>=0.0.6",
-        "pillow>=10.1.0",
+        "pillow-simd>=9.2.0",
+        "numpy>=1.26.0",
+        "numba>=0.58.1",
         "pypdf2>=3.0.1",
         "pytest>=7.4.3",
         "httpx>=0.25.1",
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import file_routes
+from core.file_processor import start_image_pool, shutdown_image_pool
 
 app = FastAPI(
     title="TradeShow Scout - File Processor",
@@ -18,4 +19,14 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(file_routes.router, prefix="/api/v1", tags=["files"])
\ No newline at end of file
+app.include_router(file_routes.router, prefix="/api/v1", tags=["files"])
+
+@app.on_event("startup")
+async def start_workers():
+    """Start the image processing worker pool"""
+    start_image_pool()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    """Shut down the image processing worker pool"""
+    shutdown_image_pool()
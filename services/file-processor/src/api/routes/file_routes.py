@@ -5,6 +5,9 @@ from core.models import ProcessingResponse
 router = APIRouter()
 file_processor = FileProcessor()
 
+_ALLOWED_TYPES = frozenset({"application/pdf", "image/jpeg", "image/png"})
+_UNSUPPORTED_TYPE_DETAIL = "File must be PDF, JPG, or PNG"
+
 @router.post("/upload", 
              response_model=ProcessingResponse,
              status_code=status.HTTP_202_ACCEPTED,
@@ -24,13 +27,10 @@ async def upload_file(file: UploadFile):
         HTTPException: If file format is invalid or processing fails
     """
     # Validate file type
-    valid_types = ["application/pdf", "image/jpeg", "image/png"]
-    content_type = file.content_type or ""
-    
-    if not any(content_type.endswith(t.split('/')[-1]) for t in valid_types):
+    if (file.content_type or "") not in _ALLOWED_TYPES:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail="File must be PDF, JPG, or PNG"
+            detail=_UNSUPPORTED_TYPE_DETAIL
         )
     
     try:
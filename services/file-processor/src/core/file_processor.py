@@ -1,5 +1,12 @@
+import io
 import os
+import asyncio
+import multiprocessing
 import aiofiles
+import numba
+from concurrent.futures import ProcessPoolExecutor, wait
+from types import MappingProxyType
+from typing import Optional, Tuple
 from fastapi import UploadFile
 from PIL import Image
 from PyPDF2 import PdfReader
@@ -7,16 +14,121 @@ from datetime import datetime
 from .models import FileInfo
 from utils.image_utils import preprocess_image
 
+# Uploads are copied to disk in blocks of this size rather than read whole
+_CHUNK_SIZE = 1 << 20
+
+# File extension to content type
+_CONTENT_TYPES = MappingProxyType({
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg'
+})
+
+# Storage locations, resolved once against the startup working directory
+UPLOAD_DIR = os.path.abspath(os.path.join(os.getcwd(), "uploads"))
+PROCESSED_DIR = os.path.abspath(os.path.join(os.getcwd(), "processed"))
+
+# Whether processed images are also written to PROCESSED_DIR; they are
+# always returned in memory on FileInfo.processed_bytes
+PERSIST_PROCESSED = os.getenv("PERSIST_PROCESSED", "1") == "1"
+
+# Quality for processed images, which are always written as JPEG
+_JPEG_QUALITY = 85
+
+# Worker processes for image decoding, preprocessing and encoding, owned by
+# the app lifecycle (see start_image_pool / shutdown_image_pool)
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _warm_worker(num_threads: int) -> None:
+    """Run preprocessing once per worker so the first upload doesn't pay its setup cost"""
+    # Numba defaults each worker's parallel kernel to a thread per CPU, which
+    # across the pool would oversubscribe them; cap it at the worker's share
+    numba.set_num_threads(num_threads)
+    preprocess_image(Image.new('L', (16, 16)))
+
+def _noop() -> None:
+    """Empty task, submitted at startup to bring every worker up"""
+
+def start_image_pool(max_workers: Optional[int] = None) -> None:
+    """
+    Start the worker pool used for image processing
+    
+    Workers are started with forkserver (spawn where unavailable) rather
+    than fork, so they never inherit Numba's threading-layer state from a
+    parent that has already run parallel kernels. Those start methods
+    launch workers lazily, so one task per worker is run here and awaited,
+    leaving every worker started and warmed before the first upload.
+    
+    Args:
+        max_workers (int, optional): Worker count, defaults to the CPU count
+    """
+    global _pool
+    if _pool is not None:
+        return
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    cpus = os.cpu_count() or 1
+    max_workers = max_workers or cpus
+    _pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=_warm_worker,
+        initargs=(max(1, cpus // max_workers),)
+    )
+    wait([_pool.submit(_noop) for _ in range(max_workers)])
+
+def shutdown_image_pool() -> None:
+    """Stop the image worker pool, waiting for in-flight work"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+def _sync_process_image(image_path: str) -> bytes:
+    """
+    Preprocess an image and encode the result
+    
+    Args:
+        image_path (str): Path to image file
+        
+    Returns:
+        bytes: Processed image as JPEG
+    """
+    # Open and preprocess image
+    with Image.open(image_path) as img:
+        processed_img = preprocess_image(img)
+        
+        # Encode as JPEG regardless of input format; the libjpeg-turbo
+        # encoder is far cheaper than PNG's zlib pass and the output is
+        # smaller to hand to the OCR service
+        buffer = io.BytesIO()
+        processed_img.save(
+            buffer,
+            format='JPEG',
+            quality=_JPEG_QUALITY,
+            optimize=False,
+            progressive=False
+        )
+        
+        return buffer.getvalue()
+
 class FileProcessor:
+    # Set once the storage directories exist, so later instances skip the syscalls
+    _INITIALIZED = False
+
     def __init__(self):
-        self.upload_dir = os.path.join(os.getcwd(), "uploads")
-        self.processed_dir = os.path.join(os.getcwd(), "processed")
+        self.upload_dir = UPLOAD_DIR
+        self.processed_dir = PROCESSED_DIR
         self._ensure_directories()
 
     def _ensure_directories(self):
         """Create necessary directories if they don't exist"""
+        if FileProcessor._INITIALIZED:
+            return
         os.makedirs(self.upload_dir, exist_ok=True)
         os.makedirs(self.processed_dir, exist_ok=True)
+        FileProcessor._INITIALIZED = True
 
     async def process_file(self, file: UploadFile) -> FileInfo:
         """
@@ -36,7 +148,7 @@ class FileProcessor:
         
         # Save original file
         upload_path = os.path.join(self.upload_dir, unique_filename)
-        await self._save_file(file, upload_path)
+        file_size = await self._save_file(file, upload_path)
         
         # Get content type from file extension
         content_type = self._get_content_type(file_extension)
@@ -45,16 +157,14 @@ class FileProcessor:
         if content_type == "application/pdf":
             raise NotImplementedError("PDF processing not yet implemented")
         else:
-            processed_path = await self._process_image(upload_path)
-        
-        # Get file size
-        file_size = os.path.getsize(upload_path)
+            processed_path, processed_bytes = await self._process_image(upload_path)
         
         return FileInfo(
             original_filename=original_filename,
             file_type=content_type,
             file_size=file_size,
             processed_path=processed_path,
+            processed_bytes=processed_bytes,
             metadata={
                 "upload_path": upload_path,
                 "timestamp": timestamp
@@ -63,37 +173,45 @@ class FileProcessor:
 
     def _get_content_type(self, extension: str) -> str:
         """Map file extension to content type"""
-        content_types = {
-            '.pdf': 'application/pdf',
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg'
-        }
-        return content_types.get(extension, '')
-
-    async def _save_file(self, file: UploadFile, path: str):
-        """Save uploaded file to disk"""
+        return _CONTENT_TYPES.get(extension, '')
+
+    async def _save_file(self, file: UploadFile, path: str) -> int:
+        """Stream uploaded file to disk in fixed-size chunks, returning bytes written"""
+        bytes_written = 0
         async with aiofiles.open(path, 'wb') as out_file:
-            content = await file.read()
-            await out_file.write(content)
+            while chunk := await file.read(_CHUNK_SIZE):
+                await out_file.write(chunk)
+                bytes_written += len(chunk)
+        return bytes_written
 
-    async def _process_image(self, image_path: str) -> str:
+    async def _process_image(self, image_path: str) -> Tuple[Optional[str], bytes]:
         """
-        Process image file
+        Process image file off the event loop
+        
+        Runs in the worker pool when the app has started one, otherwise in
+        a thread so direct callers don't leave processes behind. The result
+        is written to disk only when PERSIST_PROCESSED is set.
         
         Args:
             image_path (str): Path to image file
             
         Returns:
-            str: Path to processed image
+            Tuple[Optional[str], bytes]: Path to processed image, if
+            persisted, and its JPEG bytes
         """
-        # Open and preprocess image
-        with Image.open(image_path) as img:
-            processed_img = preprocess_image(img)
-            
-            # Save processed image
-            filename = os.path.basename(image_path)
-            processed_path = os.path.join(self.processed_dir, f"processed_{filename}")
-            processed_img.save(processed_path)
-            
-            return processed_path
\ No newline at end of file
+        if _pool is None:
+            processed_bytes = await asyncio.to_thread(_sync_process_image, image_path)
+        else:
+            loop = asyncio.get_running_loop()
+            processed_bytes = await loop.run_in_executor(_pool, _sync_process_image, image_path)
+        
+        if not PERSIST_PROCESSED:
+            return None, processed_bytes
+        
+        # Save processed image
+        filename = os.path.splitext(os.path.basename(image_path))[0]
+        processed_path = os.path.join(self.processed_dir, f"processed_{filename}.jpg")
+        async with aiofiles.open(processed_path, 'wb') as out_file:
+            await out_file.write(processed_bytes)
+        
+        return processed_path, processed_bytes
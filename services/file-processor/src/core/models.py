@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 
 class FileInfo(BaseModel):
@@ -6,7 +6,9 @@ class FileInfo(BaseModel):
     original_filename: str
     file_type: str
     file_size: int
-    processed_path: str
+    processed_path: Optional[str] = None
+    # Encoded processed image for in-process consumers; never serialized
+    processed_bytes: Optional[bytes] = Field(default=None, exclude=True, repr=False)
     metadata: Optional[Dict[str, Any]] = None
 
 class ProcessingResponse(BaseModel):
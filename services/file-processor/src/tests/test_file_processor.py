@@ -1,13 +1,17 @@
 import pytest
 import os
+import subprocess
+import sys
+import textwrap
 from fastapi.testclient import TestClient
 from fastapi import UploadFile
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageEnhance
 from io import BytesIO
 from ..api.app import app
 from ..core.file_processor import FileProcessor
 from ..core.models import FileInfo
-from ..utils.image_utils import preprocess_image
+from ..utils.image_utils import preprocess_image, _fused_contrast_sharpness
 
 client = TestClient(app)
 
@@ -29,13 +33,12 @@ def test_upload_file(test_image):
 def file_processor():
     """Create a FileProcessor instance"""
     processor = FileProcessor()
-    # Clean up test directories after tests
+    # Empty test directories after tests; they are created once per process
     yield processor
     for dir_path in [processor.upload_dir, processor.processed_dir]:
         if os.path.exists(dir_path):
             for file in os.listdir(dir_path):
                 os.remove(os.path.join(dir_path, file))
-            os.rmdir(dir_path)
 
 class TestFileProcessor:
     """Test file processing functionality"""
@@ -74,6 +77,13 @@ class TestFileProcessor:
         assert result.file_type == "image/png"
         assert os.path.exists(result.processed_path)
         assert result.file_size > 0
+        with Image.open(result.processed_path) as processed_img:
+            assert processed_img.format == "JPEG"
+        
+        # Processed bytes travel in memory but stay out of the API payload
+        with open(result.processed_path, 'rb') as f:
+            assert result.processed_bytes == f.read()
+        assert "processed_bytes" not in result.model_dump()
 
     def test_create_upload_directories(self, file_processor):
         """Test creation of upload and processed directories"""
@@ -119,4 +129,54 @@ class TestFileProcessor:
         
         # Verify the processed image
         with Image.open(processed_path) as processed_img:
-            assert max(processed_img.size) <= 2000
\ No newline at end of file
+            assert max(processed_img.size) <= 2000
+
+    def test_preprocess_grayscale_leaves_input_untouched(self):
+        """Test grayscale input skips conversion without resizing the caller's image"""
+        gray_img = Image.new('L', (3000, 1500), color=128)
+        
+        processed_img = preprocess_image(gray_img)
+        
+        assert processed_img.size == (2000, 1000)
+        assert gray_img.size == (3000, 1500)
+
+    def test_fused_enhancement_matches_pil(self):
+        """Test the fused kernel reproduces the PIL contrast + sharpness chain"""
+        rng = np.random.default_rng(0)
+        img = Image.fromarray(rng.integers(0, 256, (64, 48), dtype=np.uint8), 'L')
+        
+        expected = ImageEnhance.Sharpness(ImageEnhance.Contrast(img).enhance(2.0)).enhance(1.5)
+        fused = _fused_contrast_sharpness(np.asarray(img))
+        
+        assert np.array_equal(fused, np.asarray(expected))
+
+    def test_upload_through_worker_pool_exits(self, tmp_path):
+        """Test an upload through the app's worker pool completes and the process exits"""
+        src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        script = textwrap.dedent("""
+            import sys
+            from io import BytesIO
+            from fastapi.testclient import TestClient
+            from PIL import Image
+            from api.app import app
+
+            img_byte_arr = BytesIO()
+            Image.new('RGB', (100, 100), color='white').save(img_byte_arr, format='PNG')
+            img_byte_arr.seek(0)
+            with TestClient(app) as client:
+                response = client.post(
+                    "/api/v1/upload",
+                    files={"file": ("test.png", img_byte_arr, "image/png")}
+                )
+            sys.exit(0 if response.status_code == 202 else 1)
+        """)
+        
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": src_dir},
+            capture_output=True,
+            timeout=120
+        )
+        
+        assert result.returncode == 0, result.stderr.decode()
@@ -1,7 +1,11 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import yaml
 from pydantic import BaseSettings, DirectoryPath, FilePath, HttpUrl, validator
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class ServiceConfig(BaseSettings):
     """Base service configuration"""
     name: str
@@ -21,6 +25,9 @@ class OCRConfig(BaseSettings):
     timeout: int = 300
     batch_size: int = 10
     language: str = "eng"
+    strong_denoise: bool = False  # Bilateral filter instead of 3x3 median
+    max_edge: int = 3500  # Inputs with a longer side are downscaled before OCR
+    concurrency: Optional[int] = None  # Concurrent images in flight, defaults to CPU count
 
     @validator('min_confidence')
     def validate_confidence(cls, v):
@@ -55,11 +62,12 @@ class StorageConfig(BaseSettings):
     upload_path: DirectoryPath
     processed_path: DirectoryPath
     max_file_size: int = 10_485_760  # 10MB
-    allowed_extensions: List[str] = [".jpg", ".jpeg", ".png", ".pdf"]
+    allowed_extensions: Tuple[str, ...] = (".jpg", ".jpeg", ".png", ".pdf")
 
     @validator('allowed_extensions')
     def validate_extensions(cls, v):
-        return [ext.lower() if not ext.startswith('.') else ext.lower() for ext in v]
+        # Normalized once at load, so lookups compare against ".ext" as-is
+        return tuple('.' + ext.lower().lstrip('.') for ext in v)
 
     class Config:
         env_prefix = "STORAGE_"
@@ -108,7 +116,6 @@ class Settings(BaseSettings):
     @classmethod
     def from_yaml(cls, yaml_path: Path):
         """Load settings from YAML file"""
-        import yaml
         with open(yaml_path) as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=_YamlLoader)
         return cls(**config_data)
\ No newline at end of file
@@ -1,11 +1,78 @@
 import re
-from typing import List, Dict, Optional, Tuple
+import time
+import numpy as np
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 
 from .errors import ValidationError
 from .preprocessor import Region
 
+class _PatternSet:
+    """
+    Ordered list of patterns with a combined alternation used as a prefilter
+    
+    Lines without any match, the common case, cost a single regex scan.
+    Lines with a match are evaluated pattern by pattern in list order, so
+    results are identical to trying each pattern in turn.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = [re.compile(pattern, re.MULTILINE) for pattern in patterns]
+        self._any = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns),
+            re.MULTILINE
+        )
+    
+    def finditer(self, text: str) -> Iterator[re.Match]:
+        """Yield every match of each pattern, in pattern order"""
+        if self._any.search(text) is None:
+            return
+        for pattern in self.patterns:
+            yield from pattern.finditer(text)
+    
+    def search(self, text: str) -> Optional[re.Match]:
+        """Return the first match of the first pattern that matches"""
+        for match in self.search_each(text):
+            return match
+        return None
+    
+    def search_each(self, text: str) -> Iterator[re.Match]:
+        """Yield the first match of each pattern that matches, in pattern order"""
+        if self._any.search(text) is None:
+            return
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                yield match
+
+# Confidence weights, in the order they are applied to a candidate's flags:
+# company indicator, capitalization, 3-5 words, booth context, noise
+_NAME_WEIGHTS = (0.2, 0.2, 0.2, 0.2, -0.2)
+_NAME_BASE = 0.2
+
+# Booth ID shape, 2-5 characters, booth context, size information
+_BOOTH_WEIGHTS = (0.3, 0.2, 0.3, 0.2)
+_BOOTH_BASE = 0.0
+
+def _score_table(weights: Tuple[float, ...], base: float) -> np.ndarray:
+    """
+    Confidence for every combination of feature flags
+    
+    Entry i is the clamped score of the flags set in the bits of i, summed
+    in weight order so table lookups match scoring each candidate in turn.
+    """
+    table = np.empty(1 << len(weights), dtype=np.float64)
+    for bits in range(len(table)):
+        confidence = 0.0
+        for i, weight in enumerate(weights):
+            if bits >> i & 1:
+                confidence += weight
+        table[bits] = max(0.0, min(1.0, confidence + base))
+    return table
+
+_NAME_SCORES = _score_table(_NAME_WEIGHTS, _NAME_BASE)
+_BOOTH_SCORES = _score_table(_BOOTH_WEIGHTS, _BOOTH_BASE)
+
 @dataclass
 class Company:
     """Extracted company information"""
@@ -22,6 +89,14 @@ class Booth:
     location: Optional[str]
     confidence: float
 
+@dataclass
+class _LineMatches:
+    """Pattern matches for one line of text"""
+    line: str
+    companies: List[re.Match]
+    booths: List[re.Match]
+    size: Optional[re.Match]
+
 @dataclass
 class AnalysisResult:
     """Result of text analysis"""
@@ -56,6 +131,20 @@ class TextAnalyzer:
             r'(\d+)\s*(?:square\s*(?:ft|feet|m))',
             r'(\d+)\s*[xX]\s*(\d+)'  # Dimensions like 10x20
         ]
+        
+        # Compiled once; lines that match nothing cost one scan per category
+        self._company_re = _PatternSet(self.company_patterns)
+        self._booth_re = _PatternSet(self.booth_patterns)
+        self._size_re = _PatternSet(self.size_patterns)
+        
+        # Noise filter for company names
+        self._letter_re = re.compile(r'[A-Za-z]')
+        
+        # Confidence features
+        self._company_word_re = re.compile(r'Company|Corp|Inc|LLC|Ltd')
+        self._capitalized_re = re.compile(r'^[A-Z][a-z]')
+        self._name_noise_re = re.compile(r'[^A-Za-z0-9\s&\']')
+        self._booth_id_re = re.compile(r'^[A-Z]\d+$|^\d+$')
     
     async def analyze(self, text: str) -> AnalysisResult:
         """
@@ -70,24 +159,27 @@ class TextAnalyzer:
         Raises:
             ValidationError: If analysis fails validation
         """
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         try:
             # Extract companies and booths
-            companies = await self._extract_companies(text)
-            booths = await self._extract_booth_info(text)
+            scanned = self._scan_lines(text)
+            companies, company_confidences = self._extract_companies(scanned)
+            booths, booth_confidences = self._extract_booth_info(scanned)
             
             # Match companies with booths
-            await self._match_companies_to_booths(companies, booths)
+            self._match_companies_to_booths(
+                companies, booths, company_confidences, booth_confidences
+            )
             
             # Calculate overall confidence
-            confidence = self._calculate_confidence(companies, booths)
+            confidence = self._calculate_confidence(company_confidences, booth_confidences)
             
             result = AnalysisResult(
                 companies=companies,
                 booths=booths,
                 confidence=confidence,
-                processing_time=(datetime.utcnow() - start_time).total_seconds(),
+                processing_time=time.perf_counter() - start_time,
                 raw_text=text
             )
             
@@ -104,161 +196,196 @@ class TextAnalyzer:
                 validation_errors={"error": str(e)}
             )
     
-    async def _extract_companies(self, text: str) -> List[Company]:
-        """Extract company names using pattern matching"""
-        companies = []
-        lines = text.split('\n')
+    def _scan_lines(self, text: str) -> List[_LineMatches]:
+        """
+        Run every pattern category over each line once
         
-        for line in lines:
-            for pattern in self.company_patterns:
-                matches = re.finditer(pattern, line, re.MULTILINE)
-                for match in matches:
-                    company_name = match.group(1).strip()
-                    # Skip if too short or looks like noise
-                    if len(company_name) < 3 or not re.search(r'[A-Za-z]', company_name):
-                        continue
-                        
-                    # Look for booth ID in the same line
-                    booth_id = None
-                    for booth_pattern in self.booth_patterns:
-                        booth_match = re.search(booth_pattern, line)
-                        if booth_match:
-                            booth_id = booth_match.group(1)
-                            break
-                    
-                    # Calculate confidence based on pattern match and context
-                    confidence = self._calculate_name_confidence(company_name, line)
+        Both extractors build from the result, so the booth patterns are
+        evaluated once per line rather than once per extractor. Lines with
+        no company or booth match are dropped.
+        """
+        scanned = []
+        for line in text.split('\n'):
+            companies = list(self._company_re.finditer(line))
+            booths = list(self._booth_re.search_each(line))
+            if not companies and not booths:
+                continue
+            
+            # Size only matters alongside a booth
+            size = self._size_re.search(line) if booths else None
+            scanned.append(_LineMatches(line, companies, booths, size))
+        return scanned
+    
+    def _extract_companies(self, scanned: List[_LineMatches]) -> Tuple[List[Company], np.ndarray]:
+        """
+        Extract company names from scanned lines
+        
+        Returns:
+            Tuple[List[Company], np.ndarray]: Companies and their confidences
+        """
+        names = []
+        booth_ids = []
+        flags = []
+        
+        for scan in scanned:
+            line = scan.line
+            for match in scan.companies:
+                company_name = match.group(1).strip()
+                # Skip if too short or looks like noise
+                if len(company_name) < 3 or not self._letter_re.search(company_name):
+                    continue
                     
-                    companies.append(Company(
-                        name=company_name,
-                        booth_id=booth_id or "",
-                        confidence=confidence,
-                        region=None  # Will be set when matching with regions
-                    ))
+                # Look for booth ID in the same line
+                booth_id = None
+                if scan.booths:
+                    booth_id = scan.booths[0].group(1)
+                
+                names.append(company_name)
+                booth_ids.append(booth_id or "")
+                flags.append(self._name_flags(company_name, line))
+        
+        # Calculate confidence based on pattern match and context
+        confidences = _NAME_SCORES[np.array(flags, dtype=np.intp)]
+        companies = [
+            Company(
+                name=name,
+                booth_id=booth_id,
+                confidence=float(confidence),
+                region=None  # Will be set when matching with regions
+            )
+            for name, booth_id, confidence in zip(names, booth_ids, confidences)
+        ]
         
-        return companies
+        return companies, confidences
     
-    async def _extract_booth_info(self, text: str) -> List[Booth]:
-        """Extract booth information"""
-        booths = []
-        lines = text.split('\n')
+    def _extract_booth_info(self, scanned: List[_LineMatches]) -> Tuple[List[Booth], np.ndarray]:
+        """
+        Extract booth information from scanned lines
+        
+        Returns:
+            Tuple[List[Booth], np.ndarray]: Booths and their confidences
+        """
+        booth_ids = []
+        sizes = []
+        flags = []
         
-        for line in lines:
+        for scan in scanned:
+            line = scan.line
+            if not scan.booths:
+                continue
+            
+            # Extract size if available; it is shared by the line's booths
+            size = None
+            size_match = scan.size
+            if size_match:
+                if len(size_match.groups()) == 2:  # Dimensions pattern
+                    length, width = map(int, size_match.groups())
+                    size = length * width
+                else:
+                    size = int(size_match.group(1))
+            
             # Extract booth ID
-            for pattern in self.booth_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    booth_id = match.group(1)
-                    
-                    # Extract size if available
-                    size = None
-                    for size_pattern in self.size_patterns:
-                        size_match = re.search(size_pattern, line)
-                        if size_match:
-                            if len(size_match.groups()) == 2:  # Dimensions pattern
-                                length, width = map(int, size_match.groups())
-                                size = length * width
-                            else:
-                                size = int(size_match.group(1))
-                            break
-                    
-                    # Calculate confidence based on pattern match and context
-                    confidence = self._calculate_booth_confidence(booth_id, line)
-                    
-                    booths.append(Booth(
-                        id=booth_id,
-                        size=size,
-                        location=None,  # Will be set when processing floor plan
-                        confidence=confidence
-                    ))
+            for match in scan.booths:
+                booth_id = match.group(1)
+                booth_ids.append(booth_id)
+                sizes.append(size)
+                flags.append(self._booth_flags(booth_id, line, size_match is not None))
         
-        return booths
+        # Calculate confidence based on pattern match and context
+        confidences = _BOOTH_SCORES[np.array(flags, dtype=np.intp)]
+        booths = [
+            Booth(
+                id=booth_id,
+                size=size,
+                location=None,  # Will be set when processing floor plan
+                confidence=float(confidence)
+            )
+            for booth_id, size, confidence in zip(booth_ids, sizes, confidences)
+        ]
+        
+        return booths, confidences
     
-    async def _match_companies_to_booths(
+    def _match_companies_to_booths(
         self,
         companies: List[Company],
-        booths: List[Booth]
+        booths: List[Booth],
+        company_confidences: np.ndarray,
+        booth_confidences: np.ndarray
     ) -> None:
-        """Match companies with their corresponding booths"""
-        booth_map = {booth.id: booth for booth in booths}
+        """
+        Match companies with their corresponding booths
+        
+        Matched company confidences are averaged with their booth's, both in
+        company_confidences and on the Company records.
+        """
+        if not any(company.booth_id for company in companies):
+            return
         
-        for company in companies:
-            if company.booth_id and company.booth_id in booth_map:
-                # Update company confidence based on booth match
-                booth = booth_map[company.booth_id]
-                company.confidence = (company.confidence + booth.confidence) / 2
+        booth_index = {booth.id: i for i, booth in enumerate(booths)}
+        matched = np.fromiter(
+            (booth_index.get(company.booth_id, -1) if company.booth_id else -1
+             for company in companies),
+            dtype=np.intp,
+            count=len(companies)
+        )
+        mask = matched >= 0
+        
+        # Update company confidence based on booth match
+        company_confidences[mask] = (
+            company_confidences[mask] + booth_confidences[matched[mask]]
+        ) / 2
+        for i in np.flatnonzero(mask):
+            companies[i].confidence = float(company_confidences[i])
+    
+    def _name_flags(self, name: str, context: str) -> int:
+        """Pack the company name confidence features into _NAME_WEIGHTS bits"""
+        return (
+            # Check for common company indicators
+            bool(self._company_word_re.search(name))
+            # Check for proper capitalization
+            | bool(self._capitalized_re.match(name)) << 1
+            # Check for reasonable length
+            | (3 <= len(name.split()) <= 5) << 2
+            # Check for context
+            | ('Booth' in context or 'Space' in context) << 3
+            # Check for noise
+            | bool(self._name_noise_re.search(name)) << 4
+        )
+    
+    def _booth_flags(self, booth_id: str, context: str, has_size: bool) -> int:
+        """Pack the booth confidence features into _BOOTH_WEIGHTS bits"""
+        return (
+            # Check for common booth number patterns
+            bool(self._booth_id_re.match(booth_id))
+            # Check for reasonable length
+            | (2 <= len(booth_id) <= 5) << 1
+            # Check for context
+            | ('Booth' in context or 'Space' in context) << 2
+            # Check for size information
+            | has_size << 3
+        )
     
     def _calculate_name_confidence(self, name: str, context: str) -> float:
         """Calculate confidence score for extracted company name"""
-        confidence = 0.0
-        
-        # Check for common company indicators
-        if re.search(r'Company|Corp|Inc|LLC|Ltd', name):
-            confidence += 0.2
-        
-        # Check for proper capitalization
-        if re.match(r'^[A-Z][a-z]', name):
-            confidence += 0.2
-        
-        # Check for reasonable length
-        if 3 <= len(name.split()) <= 5:
-            confidence += 0.2
-        
-        # Check for context
-        if 'Booth' in context or 'Space' in context:
-            confidence += 0.2
-        
-        # Check for noise
-        if re.search(r'[^A-Za-z0-9\s&\']', name):
-            confidence -= 0.2
-        
-        return max(0.0, min(1.0, confidence + 0.2))  # Base confidence of 0.2
+        return float(_NAME_SCORES[self._name_flags(name, context)])
     
     def _calculate_booth_confidence(self, booth_id: str, context: str) -> float:
         """Calculate confidence score for extracted booth information"""
-        confidence = 0.0
-        
-        # Check for common booth number patterns
-        if re.match(r'^[A-Z]\d+$|^\d+$', booth_id):
-            confidence += 0.3
-        
-        # Check for reasonable length
-        if 2 <= len(booth_id) <= 5:
-            confidence += 0.2
-        
-        # Check for context
-        if 'Booth' in context or 'Space' in context:
-            confidence += 0.3
-        
-        # Check for size information
-        if any(re.search(pattern, context) for pattern in self.size_patterns):
-            confidence += 0.2
-        
-        return max(0.0, min(1.0, confidence))
+        has_size = self._size_re.search(context) is not None
+        return float(_BOOTH_SCORES[self._booth_flags(booth_id, context, has_size)])
     
     def _calculate_confidence(
         self,
-        companies: List[Company],
-        booths: List[Booth]
+        company_confidences: np.ndarray,
+        booth_confidences: np.ndarray
     ) -> float:
         """Calculate overall confidence score"""
-        if not companies and not booths:
+        total_items = len(company_confidences) + len(booth_confidences)
+        if not total_items:
             return 0.0
-            
-        total_confidence = 0.0
-        total_items = 0
-        
-        # Sum company confidences
-        if companies:
-            total_confidence += sum(c.confidence for c in companies)
-            total_items += len(companies)
-        
-        # Sum booth confidences
-        if booths:
-            total_confidence += sum(b.confidence for b in booths)
-            total_items += len(booths)
         
-        return total_confidence / total_items
+        total_confidence = company_confidences.sum() + booth_confidences.sum()
+        return float(total_confidence / total_items)
     
     def _validate_result(self, result: AnalysisResult) -> None:
         """Validate analysis result"""
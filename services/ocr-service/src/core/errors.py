@@ -1,5 +1,7 @@
+import time
+from functools import cached_property
 from typing import Any, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 class OCRError(Exception):
     """Base exception class for OCR service errors"""
@@ -13,7 +15,13 @@ class OCRError(Exception):
         self.message = message
         self.details = details or {}
         self.error_code = error_code or self.__class__.__name__
-        self.timestamp = datetime.utcnow()
+        # Raw clock read; the datetime is only built when someone asks for it
+        self._created = time.time()
+
+    @cached_property
+    def timestamp(self) -> datetime:
+        """When the error was raised, as a naive UTC datetime"""
+        return datetime.fromtimestamp(self._created, timezone.utc).replace(tzinfo=None)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary format"""
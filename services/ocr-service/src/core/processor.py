@@ -1,7 +1,10 @@
+import os
+import time
+import asyncio
 from typing import List, Optional
+import numpy as np
 from PIL import Image
 import pytesseract
-from datetime import datetime
 
 from ..config.settings import OCRConfig
 from .errors import TextExtractionError, ValidationError, ImageProcessingError
@@ -9,6 +12,16 @@ from ..utils.validators import validate_confidence
 from .preprocessor import ImagePreprocessor
 from .analyzer import TextAnalyzer, AnalysisResult
 
+def _text_from_data(data: dict) -> str:
+    """Rebuild image_to_string-style text from image_to_data output, one line per Tesseract line"""
+    lines = {}
+    for i, word in enumerate(data['text']):
+        if float(data['conf'][i]) < 0 or not word.strip():
+            continue
+        key = (data['page_num'][i], data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(word)
+    return "\n".join(" ".join(words) for words in lines.values())
+
 class TesseractWrapper:
     """Wrapper for Tesseract OCR engine"""
     
@@ -30,28 +43,34 @@ class TesseractWrapper:
             TextExtractionError: If text extraction fails
         """
         try:
-            text = pytesseract.image_to_string(
-                image,
+            # pytesseract hands Tesseract a temp file encoded as image.format,
+            # PNG when unset; BMP skips the deflate (and any lossy re-encode).
+            # Set it on a view sharing the pixel data, not the caller's image
+            image.load()
+            bmp_view = image._new(image.im)
+            bmp_view.format = 'BMP'
+            
+            # One Tesseract pass yields both the words and their confidence
+            # scores; run it in a thread so the event loop stays free
+            data = await asyncio.to_thread(
+                pytesseract.image_to_data,
+                bmp_view,
                 lang=self.config.language,
-                config='--psm 11'  # Sparse text with OSD
+                config='--psm 11',  # Sparse text with OSD
+                output_type=pytesseract.Output.DICT
             )
+            text = _text_from_data(data)
             
             if not text.strip():
                 raise TextExtractionError(
                     message="No text extracted from image",
                     confidence=0.0
                 )
-                
-            # Get confidence scores
-            data = pytesseract.image_to_data(
-                image,
-                lang=self.config.language,
-                output_type=pytesseract.Output.DICT
-            )
             
             # Calculate average confidence
-            confidences = [float(conf) / 100.0 for conf in data['conf'] if conf != '-1']
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            confidences = np.asarray(data['conf'], dtype=np.float64)
+            confidences = confidences[confidences >= 0]
+            avg_confidence = float(confidences.mean()) / 100.0 if confidences.size else 0.0
             
             # Validate confidence
             validate_confidence(
@@ -81,9 +100,35 @@ class OCRProcessor:
     def __init__(self, config: OCRConfig):
         self.config = config
         self.tesseract = TesseractWrapper(config)
-        self.preprocessor = ImagePreprocessor()
+        self.preprocessor = ImagePreprocessor(
+            strong_denoise=config.strong_denoise,
+            max_edge=config.max_edge
+        )
         self.analyzer = TextAnalyzer()
         
+        # Caps concurrent CPU-bound work (preprocessing threads and Tesseract
+        # processes) across requests
+        self._ocr_slots = asyncio.Semaphore(config.concurrency or os.cpu_count() or 1)
+        
+    async def process_images(self, images: List[Image.Image]) -> List[AnalysisResult]:
+        """
+        Process a batch of images concurrently
+        
+        Images run through process_image together, bounded by the
+        configured concurrency; Tesseract is single-threaded per process,
+        so throughput scales with the number of slots.
+        
+        Args:
+            images: PIL Image objects
+            
+        Returns:
+            List[AnalysisResult]: Results in the order of images
+            
+        Raises:
+            OCRError: If processing any image fails
+        """
+        return list(await asyncio.gather(*(self.process_image(image) for image in images)))
+    
     async def process_image(self, image: Image.Image) -> AnalysisResult:
         """
         Main processing pipeline
@@ -97,25 +142,26 @@ class OCRProcessor:
         Raises:
             OCRError: If processing fails at any stage
         """
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         try:
-            # Preprocess image
-            processed_image = await self.preprocessor.prepare(image)
-            
-            # Extract text
-            text = await self.tesseract.extract_text(processed_image)
+            async with self._ocr_slots:
+                # Preprocess image
+                processed_image = await self.preprocessor.prepare(image)
+                
+                # Extract text
+                text = await self.tesseract.extract_text(processed_image)
             
             # Analyze text and extract information
             result = await self.analyzer.analyze(text)
             
             # Update processing time
-            result.processing_time = (datetime.utcnow() - start_time).total_seconds()
+            result.processing_time = time.perf_counter() - start_time
             
             return result
             
         except Exception as e:
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             if isinstance(e, (TextExtractionError, ImageProcessingError, ValidationError)):
                 if hasattr(e, 'details'):
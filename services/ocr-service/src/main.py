@@ -2,25 +2,72 @@
 TradeShow Scout OCR Service - Main Application Entry Point
 """
 import os
+import sys
+import copy
+import asyncio
+import logging
 import yaml
 import uvicorn
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
 
-def load_config():
-    """Load service configuration."""
-    env = os.getenv("ENVIRONMENT", "development")  # Fixed string concatenation bug
+if not __package__:
+    # Launched as `python src/main.py`: put the service root on sys.path so the
+    # src package, and the relative imports inside it, resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+logger = logging.getLogger(__name__)
+
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def load_config(env: Optional[str] = None) -> Dict[str, Any]:
+    """Load service configuration for env, defaulting to $ENVIRONMENT.
+
+    Each call returns its own copy of the cached parse, so callers may
+    modify it freely."""
+    return copy.deepcopy(_load_config(env or os.getenv("ENVIRONMENT", "development")))
+
+@lru_cache(maxsize=None)
+def _load_config(env: str) -> Dict[str, Any]:
+    """Parse an environment's YAML configuration once per process."""
     config_path = Path(f"config/{env}/config.yaml")
     
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
-def create_app() -> FastAPI:
+def _warm_up_ocr(ocr_settings: Dict[str, Any]) -> None:
+    """Run one throwaway preprocess and Tesseract call so the first request
+    doesn't pay for OpenCV's lazy backend init and loading traineddata."""
+    from PIL import Image
+    import pytesseract
+    from src.config.settings import OCRConfig
+    from src.core.preprocessor import ImagePreprocessor
+    from src.core.processor import TesseractWrapper
+
+    try:
+        ocr_config = OCRConfig(**ocr_settings)
+        ImagePreprocessor(
+            strong_denoise=ocr_config.strong_denoise, max_edge=ocr_config.max_edge
+        ).prepare_sync(Image.new('L', (100, 100), 255))
+        TesseractWrapper(ocr_config)
+        pytesseract.image_to_string(
+            Image.new('L', (50, 50), 255), lang=ocr_config.language
+        )
+    except Exception as e:
+        # Warm-up is an optimization only; the first request just pays the cost
+        logger.warning("OCR warm-up skipped: %s", e)
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
     """Create and configure the FastAPI application."""
-    config = load_config()
+    config = config or load_config()
     
     app = FastAPI(
         title=config["service"]["name"],
@@ -28,6 +75,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/api/docs",
         redoc_url="/api/redoc",
+        default_response_class=ORJSONResponse,
     )
 
     @app.get("/api/health")
@@ -42,8 +90,13 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup_event():
         """Initialize services on startup."""
-        # Initialize services here
-        pass
+        # OCR work runs through asyncio.to_thread; size the pool to the CPUs
+        # rather than the default cpu_count + 4, since the cv2/Tesseract
+        # calls release the GIL and are CPU bound
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=os.cpu_count())
+        )
+        await asyncio.to_thread(_warm_up_ocr, config.get("ocr", {}))
 
     @app.on_event("shutdown")
     async def shutdown_event():
@@ -56,7 +109,7 @@ def create_app() -> FastAPI:
 def main():
     """Main entry point for the OCR service."""
     config = load_config()
-    app = create_app()
+    app = create_app(config)
     
     uvicorn.run(
         app,
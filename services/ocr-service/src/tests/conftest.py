@@ -3,7 +3,6 @@ Test configuration and fixtures for the OCR service.
 """
 import os
 import pytest
-import yaml
 import shutil
 from pathlib import Path
 from fastapi.testclient import TestClient
@@ -28,16 +27,19 @@ def setup_test_environment():
 @pytest.fixture(scope="session")
 def test_config():
     """Load test configuration."""
-    config_path = Path("config/testing/config.yaml")
-    if not config_path.exists():
-        raise FileNotFoundError(f"Test configuration not found: {config_path}")
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+    from src.main import load_config
+    # Shares load_config's per-process parse with the app under test
+    return load_config("testing")
 
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Create and return test data directory."""
+    # Under pytest-xdist each worker gets its own directory, so one worker's
+    # cleanup can't remove files another is still using
     data_dir = Path("data/test")
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        data_dir = data_dir / worker
     data_dir.mkdir(parents=True, exist_ok=True)
     
     yield data_dir
@@ -80,10 +82,16 @@ def processed_dir(test_data_dir):
         if file.is_file():
             file.unlink()
 
+@pytest.fixture(scope="session")
+def app(test_config):
+    """Build the FastAPI application once; its handlers hold no per-test state."""
+    from src.main import create_app
+    # Configured explicitly: session fixtures are set up before the autouse
+    # fixture that sets ENVIRONMENT=testing
+    return create_app(test_config)
+
 @pytest.fixture
-def test_client():
+def test_client(app):
     """Create a test client for the FastAPI application."""
-    from src.main import create_app
-    app = create_app()
     with TestClient(app) as client:
         yield client
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from datetime import datetime
 
 from ..core.analyzer import TextAnalyzer, Company, Booth, AnalysisResult
@@ -59,13 +60,13 @@ async def test_analyze_valid_text(analyzer, sample_text):
     # Verify confidence score
     assert 0 <= result.confidence <= 1
 
-@pytest.mark.asyncio
-async def test_extract_companies(analyzer, sample_text):
+def test_extract_companies(analyzer, sample_text):
     """Test company name extraction"""
-    companies = await analyzer._extract_companies(sample_text)
+    companies, confidences = analyzer._extract_companies(analyzer._scan_lines(sample_text))
     
     # Verify extracted companies
     assert len(companies) >= 3
+    assert list(confidences) == [c.confidence for c in companies]
     
     # Check specific company details
     test_corp = next(c for c in companies if c.name == "Test Corporation")
@@ -76,13 +77,13 @@ async def test_extract_companies(analyzer, sample_text):
     assert acme.booth_id == "B456"
     assert 0 <= acme.confidence <= 1
 
-@pytest.mark.asyncio
-async def test_extract_booth_info(analyzer, sample_text):
+def test_extract_booth_info(analyzer, sample_text):
     """Test booth information extraction"""
-    booths = await analyzer._extract_booth_info(sample_text)
+    booths, confidences = analyzer._extract_booth_info(analyzer._scan_lines(sample_text))
     
     # Verify extracted booths
     assert len(booths) >= 3
+    assert list(confidences) == [b.confidence for b in booths]
     
     # Check specific booth details
     booth_a = next(b for b in booths if b.id == "A123")
@@ -93,8 +94,29 @@ async def test_extract_booth_info(analyzer, sample_text):
     assert booth_b.size == 400  # 400 sq ft
     assert 0 <= booth_b.confidence <= 1
 
-@pytest.mark.asyncio
-async def test_match_companies_to_booths(analyzer):
+def test_pattern_list_order(analyzer):
+    """Test the first pattern in list order wins, not the leftmost match"""
+    # Area pattern is listed before the dimensions pattern
+    booths, _ = analyzer._extract_booth_info(analyzer._scan_lines("Acme Corp (Booth A1) 10x20 400 sq ft"))
+    assert booths[0].size == 400
+    
+    # Dimensions match overlapping the area match must not hide it
+    booths, _ = analyzer._extract_booth_info(analyzer._scan_lines("Booth Z1 10x400 sq ft"))
+    assert booths[0].size == 400
+    
+    # "Booth" pattern is listed before "#"
+    companies, _ = analyzer._extract_companies(analyzer._scan_lines("Company: Foo #A1 Booth B2"))
+    assert companies[0].booth_id == "B2"
+    
+    # Each booth pattern contributes its first match only
+    booths, _ = analyzer._extract_booth_info(analyzer._scan_lines("Booth A1 Booth B2"))
+    assert [b.id for b in booths] == ["A1"]
+    
+    # Lines matching no pattern produce nothing
+    booths, confidences = analyzer._extract_booth_info(analyzer._scan_lines("nothing to see here"))
+    assert booths == [] and len(confidences) == 0
+
+def test_match_companies_to_booths(analyzer):
     """Test matching companies with booths"""
     companies = [
         Company("Test Corp", "A123", 0.8, None),
@@ -108,7 +130,12 @@ async def test_match_companies_to_booths(analyzer):
         Booth("C789", 300, "Hall A", 0.80)
     ]
     
-    await analyzer._match_companies_to_booths(companies, booths)
+    company_confidences = np.array([c.confidence for c in companies])
+    booth_confidences = np.array([b.confidence for b in booths])
+    
+    analyzer._match_companies_to_booths(
+        companies, booths, company_confidences, booth_confidences
+    )
     
     # Verify matches
     test_corp = next(c for c in companies if c.name == "Test Corp")
@@ -116,6 +143,10 @@ async def test_match_companies_to_booths(analyzer):
     
     acme = next(c for c in companies if c.name == "ACME Inc")
     assert acme.confidence == (0.9 + 0.95) / 2
+    
+    # Unmatched companies keep their confidence, and the array tracks records
+    assert companies[2].confidence == 0.7
+    assert list(company_confidences) == [c.confidence for c in companies]
 
 @pytest.mark.asyncio
 async def test_confidence_calculation(analyzer):
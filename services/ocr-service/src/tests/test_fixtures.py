@@ -8,7 +8,7 @@ def test_test_data_dir_creation(test_data_dir):
     """Test that test_data_dir fixture creates directory."""
     assert test_data_dir.exists()
     assert test_data_dir.is_dir()
-    assert test_data_dir == Path("data/test")
+    assert test_data_dir.parts[:2] == ("data", "test")
 
 def test_upload_dir_creation_and_cleanup(upload_dir):
     """Test upload_dir fixture creates directory and test file."""
@@ -4,19 +4,11 @@ Tests for the main application module.
 import os
 import pytest
 from fastapi.testclient import TestClient
-import yaml
 import asyncio
 from pathlib import Path
 from unittest.mock import patch
 
-from src.main import create_app, load_config, main
-
-@pytest.fixture
-def test_config():
-    """Fixture to provide test configuration."""
-    config_path = Path("config/testing/config.yaml")
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+from src.main import _load_config, load_config, main
 
 def test_load_config_development():
     """Test loading development configuration."""
@@ -48,9 +40,28 @@ def test_load_config_invalid_env():
         load_config()
     assert "Configuration file not found" in str(exc_info.value)
 
-def test_create_app(test_config):
+def test_load_config_cached_per_environment():
+    """Test configuration is parsed once per environment."""
+    _load_config.cache_clear()
+    assert load_config("testing") == load_config("testing")
+    assert load_config("development") != load_config("testing")
+    assert _load_config.cache_info().misses == 2
+    
+    os.environ["ENVIRONMENT"] = "development"
+    assert load_config()["service"]["environment"] == "development"
+
+def test_load_config_returns_independent_copies():
+    """Test mutating a loaded configuration doesn't affect later loads."""
+    config = load_config("testing")
+    config["service"]["port"] = 0
+    config["ocr"].clear()
+    
+    fresh = load_config("testing")
+    assert fresh["service"]["port"] == 8001
+    assert fresh["ocr"]
+
+def test_create_app(app, test_config):
     """Test FastAPI application creation."""
-    app = create_app()
     assert app.title == test_config["service"]["name"]
     assert "/api/health" in [route.path for route in app.routes]
     assert "/api/docs" in [route.path for route in app.routes]
@@ -82,10 +93,8 @@ def test_invalid_endpoints(test_client, invalid_path):
     response = test_client.get(invalid_path)
     assert response.status_code == 404
 
-def test_startup_shutdown_events():
+def test_startup_shutdown_events(app):
     """Test application startup and shutdown events."""
-    app = create_app()
-    
     # Test that startup and shutdown event handlers are registered
     startup_handlers = [handler for handler in app.router.on_startup]
     shutdown_handlers = [handler for handler in app.router.on_shutdown]
@@ -98,10 +107,8 @@ def test_startup_shutdown_events():
     assert any(handler.__name__ == "shutdown_event" for handler in shutdown_handlers)
 
 @pytest.mark.asyncio
-async def test_startup_shutdown_execution():
+async def test_startup_shutdown_execution(app):
     """Test execution of startup and shutdown events."""
-    app = create_app()
-    
     # Get the event handlers
     startup_handler = next(handler for handler in app.router.on_startup)
     shutdown_handler = next(handler for handler in app.router.on_shutdown)
@@ -1,13 +1,16 @@
 import pytest
+import asyncio
 from PIL import Image
 import numpy as np
-from unittest.mock import Mock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import ANY, DEFAULT, Mock, patch
+import pytesseract
 
 from ..core.processor import OCRProcessor, TesseractWrapper
 from ..core.errors import TextExtractionError
 from ..config.settings import OCRConfig
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_config():
     """Create mock OCR configuration"""
     return OCRConfig(
@@ -19,17 +22,18 @@ def mock_config():
         language="eng"
     )
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_image():
     """Create a sample image with text"""
     # Create a white image
     img = Image.new('RGB', (200, 100), color='white')
     return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_tesseract_data():
     """Mock Tesseract OCR output data"""
-    return {
+    # Shared across tests; read-only so a test can't leak edits into the next
+    return MappingProxyType({
         'text': ['Company: Test Corp', 'Booth: A123'],
         'conf': ['90', '85'],
         'level': [1, 1],
@@ -38,111 +42,162 @@ def mock_tesseract_data():
         'par_num': [1, 1],
         'line_num': [1, 2],
         'word_num': [1, 1]
-    }
+    })
+
+@pytest.fixture(scope="module")
+def _tesseract_patch():
+    """Patch pytesseract.image_to_data once for the module, checked against its real signature"""
+    with patch('pytesseract.image_to_data', autospec=True) as mock_to_data:
+        yield mock_to_data
+
+@pytest.fixture(autouse=True)
+def mock_to_data(_tesseract_patch):
+    """The module's image_to_data mock, cleared of calls and canned results for each test"""
+    _tesseract_patch.reset_mock()
+    _tesseract_patch.return_value = DEFAULT
+    _tesseract_patch.side_effect = None
+    return _tesseract_patch
 
 @pytest.mark.asyncio
-async def test_tesseract_wrapper_extract_text(mock_config, sample_image, mock_tesseract_data):
+async def test_tesseract_wrapper_extract_text(mock_config, sample_image, mock_tesseract_data, mock_to_data):
     """Test text extraction using TesseractWrapper"""
     wrapper = TesseractWrapper(mock_config)
     
-    with patch('pytesseract.image_to_string') as mock_to_string, \
-         patch('pytesseract.image_to_data') as mock_to_data:
-        
-        # Mock Tesseract outputs
-        mock_to_string.return_value = "Company: Test Corp\nBooth: A123"
-        mock_to_data.return_value = mock_tesseract_data
-        
-        # Test successful extraction
-        text = await wrapper.extract_text(sample_image)
-        assert "Company: Test Corp" in text
-        assert "Booth: A123" in text
-        
-        # Verify Tesseract was called with correct parameters
-        mock_to_string.assert_called_once_with(
-            sample_image,
-            lang="eng",
-            config='--psm 11'
-        )
+    # Mock Tesseract outputs
+    mock_to_data.return_value = mock_tesseract_data
+    
+    # Test successful extraction
+    text = await wrapper.extract_text(sample_image)
+    assert text == "Company: Test Corp\nBooth: A123"
+    
+    # Verify Tesseract was run once with correct parameters
+    mock_to_data.assert_called_once_with(
+        ANY,
+        lang="eng",
+        config='--psm 11',
+        output_type=pytesseract.Output.DICT
+    )
+    
+    # Tesseract gets the pixels as BMP without the caller's image changing
+    passed_image = mock_to_data.call_args.args[0]
+    assert passed_image.format == 'BMP'
+    assert passed_image.tobytes() == sample_image.tobytes()
+    assert sample_image.format is None
 
 @pytest.mark.asyncio
-async def test_tesseract_wrapper_low_confidence(mock_config, sample_image):
+async def test_tesseract_wrapper_low_confidence(mock_config, sample_image, mock_to_data):
     """Test handling of low confidence text extraction"""
     wrapper = TesseractWrapper(mock_config)
     
-    with patch('pytesseract.image_to_string') as mock_to_string, \
-         patch('pytesseract.image_to_data') as mock_to_data:
-        
-        # Mock low confidence output
-        mock_to_string.return_value = "Unclear text"
-        mock_to_data.return_value = {
-            'text': ['Unclear text'],
-            'conf': ['50'],  # Low confidence
-            'level': [1],
-            'page_num': [1],
-            'block_num': [1],
-            'par_num': [1],
-            'line_num': [1],
-            'word_num': [1]
-        }
-        
-        # Test low confidence handling
-        with pytest.raises(TextExtractionError) as exc_info:
-            await wrapper.extract_text(sample_image)
-        
-        assert "Low confidence in extracted text" in str(exc_info.value)
+    # Mock low confidence output
+    mock_to_data.return_value = {
+        'text': ['Unclear text'],
+        'conf': ['50'],  # Low confidence
+        'level': [1],
+        'page_num': [1],
+        'block_num': [1],
+        'par_num': [1],
+        'line_num': [1],
+        'word_num': [1]
+    }
+    
+    # Test low confidence handling
+    with pytest.raises(TextExtractionError) as exc_info:
+        await wrapper.extract_text(sample_image)
+    
+    assert "Low confidence in extracted text" in str(exc_info.value)
 
 @pytest.mark.asyncio
-async def test_tesseract_wrapper_no_text(mock_config, sample_image):
+async def test_tesseract_wrapper_no_text(mock_config, sample_image, mock_to_data):
     """Test handling of empty text extraction"""
     wrapper = TesseractWrapper(mock_config)
     
-    with patch('pytesseract.image_to_string') as mock_to_string:
-        # Mock empty output
-        mock_to_string.return_value = ""
-        
-        # Test empty text handling
-        with pytest.raises(TextExtractionError) as exc_info:
-            await wrapper.extract_text(sample_image)
-        
-        assert "No text extracted from image" in str(exc_info.value)
+    # Mock empty output
+    mock_to_data.return_value = {
+        'text': [''],
+        'conf': ['-1'],
+        'level': [1],
+        'page_num': [1],
+        'block_num': [0],
+        'par_num': [0],
+        'line_num': [0],
+        'word_num': [0]
+    }
+    
+    # Test empty text handling
+    with pytest.raises(TextExtractionError) as exc_info:
+        await wrapper.extract_text(sample_image)
+    
+    assert "No text extracted from image" in str(exc_info.value)
 
 @pytest.mark.asyncio
-async def test_ocr_processor_process_image(mock_config, sample_image, mock_tesseract_data):
+async def test_ocr_processor_process_image(mock_config, sample_image, mock_tesseract_data, mock_to_data):
     """Test complete OCR processing pipeline"""
     processor = OCRProcessor(mock_config)
     
     # Mock component outputs
-    with patch('pytesseract.image_to_string') as mock_to_string, \
-         patch('pytesseract.image_to_data') as mock_to_data:
-        
-        mock_to_string.return_value = "Company: Test Corp\nBooth: A123"
-        mock_to_data.return_value = mock_tesseract_data
-        
-        # Process image
-        result = await processor.process_image(sample_image)
-        
-        # Verify result structure
-        assert hasattr(result, 'companies')
-        assert hasattr(result, 'booths')
-        assert hasattr(result, 'confidence')
-        assert hasattr(result, 'processing_time')
-        
-        # Verify processing time is reasonable
-        assert result.processing_time > 0
-        assert result.processing_time < 10  # Should process within 10 seconds
+    mock_to_data.return_value = mock_tesseract_data
+    
+    # Process image
+    result = await processor.process_image(sample_image)
+    
+    # Verify result structure
+    assert hasattr(result, 'companies')
+    assert hasattr(result, 'booths')
+    assert hasattr(result, 'confidence')
+    assert hasattr(result, 'processing_time')
+    
+    # Verify processing time is reasonable
+    assert result.processing_time > 0
+    assert result.processing_time < 10  # Should process within 10 seconds
 
 @pytest.mark.asyncio
-async def test_ocr_processor_error_handling(mock_config, sample_image):
+async def test_ocr_processor_error_handling(mock_config, sample_image, mock_to_data):
     """Test error handling in OCR processing pipeline"""
     processor = OCRProcessor(mock_config)
     
-    with patch('pytesseract.image_to_string') as mock_to_string:
-        # Simulate Tesseract error
-        mock_to_string.side_effect = Exception("Tesseract error")
-        
-        # Test error handling
-        with pytest.raises(TextExtractionError) as exc_info:
-            await processor.process_image(sample_image)
-        
-        assert "OCR processing failed" in str(exc_info.value)
-        assert "processing_time" in exc_info.value.details
\ No newline at end of file
+    # Simulate Tesseract error
+    mock_to_data.side_effect = Exception("Tesseract error")
+    
+    # Test error handling
+    with pytest.raises(TextExtractionError) as exc_info:
+        await processor.process_image(sample_image)
+    
+    assert "OCR processing failed" in str(exc_info.value)
+    assert "processing_time" in exc_info.value.details
+
+@pytest.mark.asyncio
+async def test_ocr_processor_process_images_bounded(mock_config, sample_image):
+    """Test batch processing keeps input order and respects the concurrency cap"""
+    processor = OCRProcessor(mock_config.copy(update={"concurrency": 2}))
+    in_flight = 0
+    peak = 0
+    
+    async def fake_prepare(image):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return image
+    
+    async def fake_extract(image):
+        return image.info["label"]
+    
+    async def fake_analyze(text):
+        return SimpleNamespace(text=text, processing_time=0.0)
+    
+    images = []
+    for i in range(5):
+        image = sample_image.copy()
+        image.info["label"] = f"image {i}"
+        images.append(image)
+    
+    with patch.object(processor.preprocessor, 'prepare', fake_prepare), \
+         patch.object(processor.tesseract, 'extract_text', fake_extract), \
+         patch.object(processor.analyzer, 'analyze', fake_analyze):
+        results = await processor.process_images(images)
+    
+    assert [result.text for result in results] == [f"image {i}" for i in range(5)]
+    assert peak == 2
+
@@ -1,35 +1,40 @@
 import os
+import shutil
 import pytest
 from pathlib import Path
-from PIL import Image
+from unittest.mock import patch
 
 from ..utils.validators import (
+    StatCache,
     validate_file_size,
     validate_file_extension,
     validate_image,
+    validate_images_batch,
     validate_confidence,
     ensure_directory,
     sanitize_filename,
+    sanitize_filenames,
     generate_safe_path
 )
 from ..core.errors import ValidationError, StorageError
 
-@pytest.fixture
-def sample_image(tmp_path):
-    """Create a sample image file for testing"""
-    image_path = tmp_path / "test_image.jpg"
-    # Create a 100x100 black image
-    image = Image.new('RGB', (100, 100), color='black')
-    image.save(image_path)
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+@pytest.fixture(scope="module")
+def sample_image(tmp_path_factory):
+    """Create a sample image file for testing, shared read-only by the module"""
+    image_path = tmp_path_factory.mktemp("images") / "test_image.jpg"
+    # Copy a pre-encoded 100x100 black JPEG
+    shutil.copyfile(ASSETS_DIR / "black_100.jpg", image_path)
     return image_path
 
 @pytest.fixture
 def large_file(tmp_path):
     """Create a large test file"""
     file_path = tmp_path / "large_file.txt"
-    # Create a 2MB file
-    with open(file_path, 'wb') as f:
-        f.write(b'0' * (2 * 1024 * 1024))
+    # Create a 2MB file; sparse, since the validators only read its size
+    file_path.touch()
+    os.truncate(file_path, 2 * 1024 * 1024)
     return file_path
 
 def test_validate_file_size(large_file):
@@ -47,6 +52,31 @@ def test_validate_file_size(large_file):
         validate_file_size("nonexistent.txt", max_size=1024)
     assert "Error checking file size" in str(exc_info.value)
 
+def test_validate_file_size_rejects_symlink(large_file, tmp_path):
+    """Test size validation refuses symlinks rather than checking their target"""
+    link = tmp_path / "link.txt"
+    link.symlink_to(large_file)
+    
+    with pytest.raises(StorageError) as exc_info:
+        validate_file_size(link, max_size=3 * 1024 * 1024)
+    assert "symlink" in str(exc_info.value)
+    
+    with pytest.raises(StorageError):
+        validate_file_size(link, max_size=3 * 1024 * 1024, stat_cache=StatCache())
+
+def test_validate_file_size_stat_cache(large_file):
+    """Test file size validation reuses cached stat results until forgotten"""
+    cache = StatCache()
+    assert validate_file_size(large_file, max_size=3 * 1024 * 1024, stat_cache=cache)
+    
+    # A cached result is served without looking at the file again
+    os.truncate(large_file, 4 * 1024 * 1024)
+    assert validate_file_size(large_file, max_size=3 * 1024 * 1024, stat_cache=cache)
+    
+    cache.forget(large_file)
+    with pytest.raises(StorageError):
+        validate_file_size(large_file, max_size=3 * 1024 * 1024, stat_cache=cache)
+
 def test_validate_file_extension(sample_image, tmp_path):
     """Test file extension validation"""
     # Test valid extension
@@ -62,7 +92,7 @@ def test_validate_file_extension(sample_image, tmp_path):
     # Test case insensitive validation
     assert validate_file_extension(sample_image, [".JPG", ".JPEG", ".PNG"])
 
-def test_validate_image(sample_image):
+def test_validate_image(sample_image, tmp_path):
     """Test image validation"""
     # Test valid image
     assert validate_image(sample_image)
@@ -76,11 +106,29 @@ def test_validate_image(sample_image):
     assert "less than minimum required" in str(exc_info.value)
     
     # Test invalid image file
-    invalid_image = sample_image.parent / "invalid.jpg"
+    invalid_image = tmp_path / "invalid.jpg"
     invalid_image.write_text("not an image")
     with pytest.raises(ValidationError) as exc_info:
         validate_image(invalid_image)
     assert "Error validating image" in str(exc_info.value)
+    
+    # Test extension Pillow can't open
+    text_file = tmp_path / "notes.txt"
+    text_file.write_text("not an image")
+    with pytest.raises(ValidationError) as exc_info:
+        validate_image(text_file)
+    assert "Unsupported image extension" in str(exc_info.value)
+
+def test_validate_images_batch(sample_image, tmp_path):
+    """Test batch image validation keeps order and reports every failure"""
+    assert validate_images_batch([sample_image] * 3, min_width=50) == [True] * 3
+    
+    invalid_image = tmp_path / "invalid.jpg"
+    invalid_image.write_text("not an image")
+    with pytest.raises(ExceptionGroup) as exc_info:
+        validate_images_batch([sample_image, invalid_image, invalid_image], max_workers=2)
+    assert len(exc_info.value.exceptions) == 2
+    assert all(isinstance(e, ValidationError) for e in exc_info.value.exceptions)
 
 def test_validate_confidence():
     """Test confidence score validation"""
@@ -108,6 +156,11 @@ def test_ensure_directory(tmp_path):
     # Test existing directory
     assert ensure_directory(new_dir) == created_dir
     
+    # Test a directory seen before is trusted without another mkdir
+    with patch.object(Path, "mkdir") as mock_mkdir:
+        assert ensure_directory(new_dir) == created_dir
+    mock_mkdir.assert_not_called()
+    
     # Test invalid path (on systems where /dev/null/invalid would be invalid)
     with pytest.raises(StorageError) as exc_info:
         ensure_directory("/dev/null/invalid")
@@ -130,6 +183,22 @@ def test_sanitize_filename():
     # Test null bytes
     assert sanitize_filename("test\0.jpg") == "test_.jpg"
 
+def test_sanitize_filename_unicode_lookalikes():
+    """Test Unicode slash and dot look-alikes can't smuggle in traversal"""
+    # Full-width solidus and full stop fold to "/" and "." under NFKC
+    assert sanitize_filename("\uff0e\uff0e\uff0fetc\uff0fpasswd") == "passwd"
+    assert sanitize_filename("\uff0e\uff0e") == "unnamed_file"
+    assert sanitize_filename("..") == "unnamed_file"
+    
+    # Division slash has no compatibility mapping, so it is replaced directly
+    assert sanitize_filename("..\u2215..\u2215passwd") == ".._.._passwd"
+
+def test_sanitize_filenames():
+    """Test batch filename sanitization matches the single-name version"""
+    names = ["test.jpg", "../../../etc/passwd", "a|b?.png", ""]
+    assert sanitize_filenames(names) == [sanitize_filename(name) for name in names]
+    assert sanitize_filenames(iter(["x*y.jpg"])) == ["x_y.jpg"]
+
 def test_generate_safe_path(tmp_path):
     """Test safe path generation"""
     # Test basic path generation
@@ -151,4 +220,22 @@ def test_generate_safe_path(tmp_path):
     new_dir = tmp_path / "new_dir"
     safe_path = generate_safe_path(new_dir, "test.jpg")
     assert safe_path.parent.exists()
-    assert safe_path.parent == new_dir
\ No newline at end of file
+    assert safe_path.parent == new_dir
+
+def test_generate_safe_path_stays_in_base(tmp_path):
+    """Test names that would resolve outside the base directory are refused"""
+    # Directory references are renamed by sanitize_filename before the check
+    assert generate_safe_path(tmp_path, "..") == tmp_path / "unnamed_file"
+    
+    # A symlink already planted under the name points elsewhere
+    (tmp_path / "planted.jpg").symlink_to(tmp_path.parent / "outside.jpg")
+    with pytest.raises(StorageError):
+        generate_safe_path(tmp_path, "planted.jpg")
+
+def test_generate_safe_path_relative_base_follows_cwd(tmp_path, monkeypatch):
+    """Test a relative base directory is checked against the current working directory"""
+    for root in ("first", "second"):
+        (tmp_path / root).mkdir()
+        monkeypatch.chdir(tmp_path / root)
+        path = generate_safe_path("uploads", "map.jpg")
+        assert path.absolute() == tmp_path / root / "uploads" / "map.jpg"
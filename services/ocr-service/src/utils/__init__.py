@@ -1,19 +1,25 @@
 from .validators import (
+    StatCache,
     validate_file_size,
     validate_file_extension,
     validate_image,
+    validate_images_batch,
     validate_confidence,
     ensure_directory,
     sanitize_filename,
+    sanitize_filenames,
     generate_safe_path
 )
 
 __all__ = [
+    'StatCache',
     'validate_file_size',
     'validate_file_extension',
     'validate_image',
+    'validate_images_batch',
     'validate_confidence',
     'ensure_directory',
     'sanitize_filename',
+    'sanitize_filenames',
     'generate_safe_path'
 ]
\ No newline at end of file
@@ -1,26 +1,88 @@
 import os
+import re
+import stat
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
-from PIL import Image
+from typing import Collection, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 
 from ..core.errors import ValidationError, StorageError
 
-def validate_file_size(file_path: Union[str, Path], max_size: int) -> bool:
+# Characters sanitize_filename replaces with '_'. A compiled character class
+# scans clean names faster than str.translate's per-character table lookups.
+# Besides the ASCII set it covers slash look-alikes NFKC leaves alone
+# (division, fraction and big solidus, big reverse solidus)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\x00\u2215\u2044\u29f8\u29f9]')
+
+# Absolute directories ensure_directory has already created or found, so
+# repeat calls for an upload dir skip the mkdir. Failures aren't remembered
+_ensured_dirs: Set[Path] = set()
+
+# Extensions Pillow can open, filled on first use; registered_extensions()
+# imports every plugin, so that cost is paid once rather than per call
+_image_extensions: Optional[frozenset] = None
+
+def _known_image_extensions() -> frozenset:
+    """Lower-case, dotted extensions with a registered Pillow plugin"""
+    global _image_extensions
+    if _image_extensions is None:
+        from PIL import Image
+        _image_extensions = frozenset(Image.registered_extensions())
+    return _image_extensions
+
+@dataclass
+class StatCache:
+    """Memoized lstat results, so a file validated several ways is stat'ed once"""
+    _stats: Dict[str, os.stat_result] = field(default_factory=dict)
+    
+    def get(self, path: Union[str, Path]) -> os.stat_result:
+        """Return path's own stat result (symlinks not followed), statting on a miss"""
+        key = os.fspath(path)
+        st = self._stats.get(key)
+        if st is None:
+            st = self._stats[key] = os.stat(key, follow_symlinks=False)
+        return st
+    
+    def forget(self, path: Union[str, Path]) -> None:
+        """Drop the cached result for path, e.g. after it has been written"""
+        self._stats.pop(os.fspath(path), None)
+
+def validate_file_size(
+    file_path: Union[str, Path],
+    max_size: int,
+    stat_cache: Optional[StatCache] = None
+) -> bool:
     """
     Validate file size against maximum allowed size
     
     Args:
         file_path: Path to the file
         max_size: Maximum allowed size in bytes
+        stat_cache: Optional cache shared with other checks on the same file
         
     Returns:
         bool: True if file size is valid
         
     Raises:
-        StorageError: If file size exceeds maximum allowed size
+        StorageError: If file size exceeds maximum allowed size, or the path
+            is a symlink
     """
     try:
-        file_size = os.path.getsize(file_path)
+        # Stat the path itself: a symlink would let the size check pass on
+        # one file while the caller goes on to read another
+        if stat_cache is not None:
+            st = stat_cache.get(file_path)
+        else:
+            st = os.stat(file_path, follow_symlinks=False)
+        if stat.S_ISLNK(st.st_mode):
+            raise StorageError(
+                message="Refusing to validate a symlink",
+                file_path=str(file_path),
+                operation="size_validation"
+            )
+        file_size = st.st_size
         if file_size > max_size:
             raise StorageError(
                 message=f"File size {file_size} exceeds maximum allowed size {max_size}",
@@ -35,16 +97,21 @@ def validate_file_size(file_path: Union[str, Path], max_size: int) -> bool:
             operation="size_validation"
         )
 
+@lru_cache(maxsize=32)
+def _extension_set(extensions: Tuple[str, ...]) -> FrozenSet[str]:
+    """Lower-cased lookup set for an allowlist; callers reuse a few allowlists"""
+    return frozenset(ext.lower() for ext in extensions)
+
 def validate_file_extension(
     file_path: Union[str, Path],
-    allowed_extensions: List[str]
+    allowed_extensions: Collection[str]
 ) -> bool:
     """
     Validate file extension against list of allowed extensions
     
     Args:
         file_path: Path to the file
-        allowed_extensions: List of allowed file extensions
+        allowed_extensions: Allowed file extensions, matched case-insensitively
         
     Returns:
         bool: True if file extension is valid
@@ -53,7 +120,7 @@ def validate_file_extension(
         ValidationError: If file extension is not allowed
     """
     ext = os.path.splitext(str(file_path))[1].lower()
-    if ext not in allowed_extensions:
+    if ext not in _extension_set(tuple(allowed_extensions)):
         raise ValidationError(
             message=f"File extension {ext} not allowed. Allowed extensions: {allowed_extensions}",
             validation_errors={"extension": ext, "allowed": allowed_extensions}
@@ -79,7 +146,21 @@ def validate_image(
     Raises:
         ValidationError: If image validation fails
     """
+    # Pillow is imported on first use so the path and filename helpers
+    # don't pay for it
+    from PIL import Image
+    
+    # Reject extensions Pillow has no plugin for without opening the file
+    ext = os.path.splitext(str(image_path))[1].lower()
+    if ext not in _known_image_extensions():
+        raise ValidationError(
+            message=f"Unsupported image extension {ext}",
+            validation_errors={"extension": ext}
+        )
+    
     try:
+        # Image.open only parses the header; size comes from it without
+        # decoding, so nothing here may call load() or transpose the image
         with Image.open(image_path) as img:
             width, height = img.size
             
@@ -102,6 +183,44 @@ def validate_image(
             validation_errors={"error": str(e)}
         )
 
+def validate_images_batch(
+    image_paths: Iterable[Union[str, Path]],
+    min_width: Optional[int] = None,
+    min_height: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> List[bool]:
+    """
+    Validate many image files concurrently
+    
+    The checks are mostly file I/O and Pillow header parsing, which release
+    the GIL, so they run on a thread pool.
+    
+    Args:
+        image_paths: Paths to the image files
+        min_width: Minimum required width in pixels
+        min_height: Minimum required height in pixels
+        max_workers: Thread count, by default min(32, 4 x CPUs)
+        
+    Returns:
+        List[bool]: True for each image, in input order
+        
+    Raises:
+        ExceptionGroup: Every ValidationError raised, if any image fails
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(validate_image, path, min_width, min_height)
+            for path in image_paths
+        ]
+    
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        raise ExceptionGroup(f"{len(errors)} of {len(futures)} images failed validation", errors)
+    return [f.result() for f in futures]
+
 def validate_confidence(
     confidence: float,
     min_confidence: float,
@@ -148,7 +267,10 @@ def ensure_directory(directory: Union[str, Path]) -> Path:
     """
     try:
         path = Path(directory)
-        path.mkdir(parents=True, exist_ok=True)
+        key = path.absolute()
+        if key not in _ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(key)
         return path
     except OSError as e:
         raise StorageError(
@@ -167,20 +289,39 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
+    # Fold compatibility forms first, so full-width slashes and dots become
+    # the ASCII characters the steps below handle
+    filename = unicodedata.normalize('NFKC', filename)
+    
     # Remove path separators and null bytes
     filename = os.path.basename(filename)
     
-    # Replace potentially dangerous characters
-    unsafe_chars = '<>:"/\\|?*\0'
-    for char in unsafe_chars:
-        filename = filename.replace(char, '_')
+    # Replace potentially dangerous characters in a single pass
+    filename = _UNSAFE_FILENAME_CHARS.sub('_', filename)
         
-    # Ensure filename is not empty
-    if not filename:
+    # Ensure filename is not empty or a directory reference
+    if filename in ("", ".", ".."):
         filename = "unnamed_file"
         
     return filename
 
+def sanitize_filenames(filenames: Iterable[str]) -> List[str]:
+    """
+    Sanitize a batch of filenames, e.g. a scanned exhibitor directory
+    
+    Args:
+        filenames: Original filenames
+        
+    Returns:
+        List[str]: Sanitized filenames, in input order
+    """
+    return [sanitize_filename(filename) for filename in filenames]
+
+@lru_cache(maxsize=128)
+def _canonical_base(base_dir: str) -> Path:
+    """Resolved form of a base directory; uploads reuse a few, and resolve() walks the filesystem"""
+    return Path(base_dir).resolve()
+
 def generate_safe_path(
     base_dir: Union[str, Path],
     filename: str,
@@ -207,16 +348,26 @@ def generate_safe_path(
         # Sanitize filename
         safe_filename = sanitize_filename(filename)
         
-        # Generate full path
-        full_path = base_path / safe_filename
+        # Base directory plus separator, measured once for both the length
+        # check and the truncation
+        base_str = str(base_path)
+        prefix_length = len(base_str) + 1
         
         # Handle path length restrictions
-        if len(str(full_path)) > max_length:
+        if prefix_length + len(safe_filename) > max_length:
             name, ext = os.path.splitext(safe_filename)
             # Truncate name while preserving extension
-            max_name_length = max_length - len(str(base_path)) - len(ext) - 1
-            truncated_name = name[:max_name_length]
-            full_path = base_path / f"{truncated_name}{ext}"
+            max_name_length = max_length - prefix_length - len(ext)
+            safe_filename = f"{name[:max_name_length]}{ext}"
+        
+        # Generate full path
+        full_path = base_path / safe_filename
+        
+        # The file must land directly in the base directory; a symlink may
+        # already exist under the name. The cache is keyed on the absolute
+        # base, since a relative one changes meaning with the working directory
+        if full_path.resolve().parent != _canonical_base(str(base_path.absolute())):
+            raise ValueError(f"{safe_filename!r} resolves outside {base_path}")
             
         return full_path
     except Exception as e: